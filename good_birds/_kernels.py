@@ -0,0 +1,78 @@
+"""
+Optional Numba-accelerated scoring kernel.
+
+Numba is an optional dependency (install with `pip install good-birds[fast]`).
+When available, grayscale Laplacian variance and exposure clipping statistics
+are fused into a single parallel pass over the pixel buffer, instead of the
+OpenCV + histogram chain that materializes several intermediate arrays.
+When Numba is missing, callers fall back to the plain NumPy/OpenCV path.
+"""
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True, parallel=True)
+    def laplacian_var_and_exposure(gray, y0, y1, x0, x1):
+        """
+        One fused pass over a grayscale uint8 image.
+
+        Computes the 4-neighbour Laplacian variance for the whole frame and
+        for the [y0:y1, x0:x1] center ROI, plus the fraction of clipped
+        highlight (>= 250) and crushed shadow (< 5) pixels.
+
+        Returns (whole_var, center_var, highlight_frac, shadow_frac).
+        """
+        h, w = gray.shape
+
+        lap_sum = 0.0
+        lap_sq = 0.0
+        c_sum = 0.0
+        c_sq = 0.0
+        c_n = 0
+        high = 0
+        low = 0
+
+        for y in prange(h):
+            for x in range(w):
+                v = gray[y, x]
+                if v >= 250:
+                    high += 1
+                elif v < 5:
+                    low += 1
+
+                if 1 <= y < h - 1 and 1 <= x < w - 1:
+                    lap = float(
+                        np.int32(gray[y + 1, x]) + np.int32(gray[y - 1, x])
+                        + np.int32(gray[y, x + 1]) + np.int32(gray[y, x - 1])
+                        - 4 * np.int32(v)
+                    )
+                    lap_sum += lap
+                    lap_sq += lap * lap
+                    if y0 <= y < y1 and x0 <= x < x1:
+                        c_sum += lap
+                        c_sq += lap * lap
+                        c_n += 1
+
+        n = (h - 2) * (w - 2)
+        if n <= 0:
+            return 0.0, 0.0, 0.0, 0.0
+
+        mean = lap_sum / n
+        whole_var = lap_sq / n - mean * mean
+
+        if c_n > 0:
+            c_mean = c_sum / c_n
+            center_var = c_sq / c_n - c_mean * c_mean
+        else:
+            center_var = whole_var
+
+        total = h * w
+        return whole_var, center_var, high / total, low / total
+else:
+    laplacian_var_and_exposure = None
@@ -2,58 +2,77 @@ import datetime
 import logging
 from typing import List
 
+import numpy as np
+
 from .models import PhotoInfo, Burst, ScoredPhoto
 
 logger = logging.getLogger(__name__)
 
+def normalize_scores(burst_photos: List[ScoredPhoto]) -> None:
+    """
+    Normalize sharpness and exposure scores within a burst
+    so they are on a comparable scale (0.0 to 1.0) before combining.
+    """
+    if not burst_photos:
+        return
+
+    count = len(burst_photos)
+    s = np.fromiter((p.sharpness_score for p in burst_photos), dtype=np.float64, count=count)
+    e = np.fromiter((p.exposure_score for p in burst_photos), dtype=np.float64, count=count)
+
+    # Min-max rescale each field in one vectorized pass.
+    # If all values are identical the range is 0 and everything gets 1.0.
+    s_range = s.max() - s.min()
+    if s_range > 0:
+        s = (s - s.min()) / s_range
+    else:
+        s = np.ones_like(s)  # They are all the same
+
+    # Exposure is already bounded 0-1 from our basic metric, but let's stretch it
+    e_range = e.max() - e.min()
+    if e_range > 0:
+        e = (e - e.min()) / e_range
+    else:
+        e = np.ones_like(e)
+
+    for p, sv, ev in zip(burst_photos, s, e):
+        p.sharpness_score = float(sv)
+        p.exposure_score = float(ev)
+
 def group_into_bursts(photos: List[PhotoInfo], threshold_seconds: float = 1.0) -> List[Burst]:
     """
     Group a chronologically sorted list of photos into bursts.
-    A new burst starts when the time difference between consecutive photos 
+    A new burst starts when the time difference between consecutive photos
     exceeds the threshold.
+
+    Timestamps (including sub-second EXIF data) are converted to a single
+    int64 microsecond array so sorting and gap detection happen in one
+    C-level NumPy pass instead of a Python loop over timedelta objects.
     """
     if not photos:
         logger.warning("No photos provided to group_into_bursts.")
         return []
 
     logger.info(f"Grouping {len(photos)} photos with threshold {threshold_seconds}s")
-    # Ensure the list is sorted just in case
-    sorted_photos = sorted(photos, key=lambda p: p.full_timestamp_sort_key)
-    
-    bursts = []
-    current_burst_photos = [ScoredPhoto(info=sorted_photos[0])]
-    
-    for i in range(1, len(sorted_photos)):
-        current_photo = sorted_photos[i]
-        prev_photo = sorted_photos[i-1]
-        
-        # Calculate time diff
-        time_diff = current_photo.timestamp - prev_photo.timestamp
-        diff_seconds = time_diff.total_seconds()
-        
-        # Consider sub-seconds if timestamps are exactly the same
-        if diff_seconds == 0:
-            try:
-                cur_sub = int(current_photo.sub_sec)
-                prev_sub = int(prev_photo.sub_sec)
-                # A very rough approximation, we just care if they are close.
-                # Usually sub_sec is 2 digits (1/100s)
-                diff_seconds = abs(cur_sub - prev_sub) / 100.0
-            except ValueError:
-                pass
-                
-        if diff_seconds <= threshold_seconds:
-            # Belongs to the current burst
-            current_burst_photos.append(ScoredPhoto(info=current_photo))
-        else:
-            # Start a new burst
-            bursts.append(Burst(photos=current_burst_photos))
-            current_burst_photos = [ScoredPhoto(info=current_photo)]
-            
-    # Add the last burst
-    if current_burst_photos:
-        bursts.append(Burst(photos=current_burst_photos))
-        
+
+    ts_us = np.fromiter(
+        (p.full_timestamp_sort_key for p in photos),
+        dtype=np.int64,
+        count=len(photos)
+    )
+
+    # Stable argsort keeps equal timestamps in their original order
+    order = np.argsort(ts_us, kind='stable')
+    sorted_ts = ts_us[order]
+
+    # A burst boundary is any gap larger than the threshold
+    splits = np.where(np.diff(sorted_ts) > threshold_seconds * 1_000_000)[0] + 1
+
+    bursts = [
+        Burst(photos=[ScoredPhoto(info=photos[i]) for i in group])
+        for group in np.split(order, splits)
+    ]
+
     logger.info(f"Created {len(bursts)} bursts.")
-    
+
     return bursts
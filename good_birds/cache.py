@@ -0,0 +1,126 @@
+"""
+Persistent per-directory caches.
+
+Re-running on the same directory used to re-extract and re-score every
+preview. Scores and EXIF metadata only depend on the file contents, so we
+key them by (path, size, mtime) and persist them inside the scanned
+directory: scores in a JSON file, scanned PhotoInfo records in a small
+SQLite database. A file that was edited or replaced gets a new key and is
+rescanned/rescored automatically.
+"""
+import json
+import logging
+import os
+import pickle
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILENAME = ".good_birds_cache.json"
+EXIF_CACHE_FILENAME = ".good_birds_exif.sqlite"
+
+
+def cache_key(path: Path) -> Optional[str]:
+    """
+    Build the cache key for a file: "path|size|mtime".
+    Returns None if the file can't be stat'd.
+    """
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return f"{path}|{st.st_size}|{int(st.st_mtime)}"
+
+
+def load_cache(directory: Path) -> Dict[str, Tuple[float, float]]:
+    """
+    Load cached (sharpness, exposure) scores for a directory.
+    Returns an empty dict if the cache is missing or unreadable.
+    """
+    cache_path = directory / CACHE_FILENAME
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            raw = json.load(f)
+        cache = {k: (float(v[0]), float(v[1])) for k, v in raw.items()}
+        logger.info(f"Loaded {len(cache)} cached scores from {cache_path}")
+        return cache
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError, TypeError, IndexError) as e:
+        logger.warning(f"Ignoring unreadable score cache {cache_path}: {e}")
+        return {}
+
+
+def save_cache(directory: Path, cache: Dict[str, Tuple[float, float]]) -> None:
+    """
+    Atomically write the score cache back to the directory.
+    Written to a temp file first and moved into place with os.replace so a
+    crash mid-write never leaves a truncated cache behind.
+    """
+    cache_path = directory / CACHE_FILENAME
+    tmp_path = directory / (CACHE_FILENAME + ".tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({k: list(v) for k, v in cache.items()}, f)
+        os.replace(tmp_path, cache_path)
+        logger.info(f"Saved {len(cache)} scores to {cache_path}")
+    except OSError as e:
+        logger.warning(f"Failed to save score cache {cache_path}: {e}")
+
+
+def load_exif_cache(directory: Path) -> Dict[str, Tuple[int, int, object]]:
+    """
+    Load cached PhotoInfo records for a directory, keyed by path string.
+    Each value is (mtime_ns, size, PhotoInfo); the caller compares the stat
+    fields to decide whether the entry is still fresh. Returns an empty
+    dict if the cache is missing or unreadable.
+    """
+    cache_path = directory / EXIF_CACHE_FILENAME
+    if not cache_path.exists():
+        return {}
+    try:
+        with closing(sqlite3.connect(cache_path)) as conn:
+            rows = conn.execute(
+                "SELECT path, mtime, size, pickled FROM exif"
+            ).fetchall()
+        cache = {
+            path: (mtime, size, pickle.loads(blob))
+            for path, mtime, size, blob in rows
+        }
+        logger.info(f"Loaded {len(cache)} cached EXIF records from {cache_path}")
+        return cache
+    except (sqlite3.Error, pickle.UnpicklingError, OSError) as e:
+        logger.warning(f"Ignoring unreadable EXIF cache {cache_path}: {e}")
+        return {}
+
+
+def save_exif_cache(directory: Path, entries: Iterable[Tuple[Path, os.stat_result, object]]) -> None:
+    """
+    Upsert freshly scanned PhotoInfo records into the directory's EXIF cache.
+    `entries` is an iterable of (path, stat_result, PhotoInfo). All rows are
+    written in a single transaction; the path is the primary key, so stale
+    rows for edited files are replaced rather than accumulating.
+    """
+    rows = [
+        (str(path), st.st_mtime_ns, st.st_size, pickle.dumps(info))
+        for path, st, info in entries
+    ]
+    if not rows:
+        return
+    cache_path = directory / EXIF_CACHE_FILENAME
+    try:
+        with closing(sqlite3.connect(cache_path)) as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS exif "
+                "(path TEXT PRIMARY KEY, mtime INTEGER, size INTEGER, pickled BLOB)"
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO exif VALUES (?, ?, ?, ?)", rows
+            )
+            conn.commit()
+        logger.info(f"Saved {len(rows)} EXIF records to {cache_path}")
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"Failed to save EXIF cache {cache_path}: {e}")
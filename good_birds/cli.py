@@ -1,52 +1,89 @@
 import argparse
+import io
+import os
 import sys
 import logging
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
 from pathlib import Path
 
 import click
+import numpy as np
 import rawpy
 from PIL import Image
 from rich.console import Console
 from rich.progress import Progress
 from rich.table import Table
 
-from good_birds.burst import group_into_bursts
+try:
+    # libjpeg-turbo's SIMD decoder is 2-4x faster than PIL for the
+    # thousands of embedded preview JPEGs a big run decodes. The
+    # constructor raises if the shared library is missing, so probe once.
+    from turbojpeg import TJPF_GRAY, TurboJPEG
+    _turbojpeg = TurboJPEG()
+except Exception:
+    _turbojpeg = None
+
+from good_birds.burst import group_into_bursts, normalize_scores
+from good_birds.cache import cache_key, load_cache, save_cache
 from good_birds.models import PhotoInfo, ScoredPhoto
-from good_birds.rating import is_exiftool_installed, write_rating
-from good_birds.scanner import scan_directory
-from good_birds.scorer import score_photo
+from good_birds.preview import read_embedded_jpeg
+from good_birds.rating import ExifToolSession, is_exiftool_installed, write_rating
+from good_birds.scanner import RAW_EXTENSIONS, scan_directory
+from good_birds.scorer import is_unrecoverable, score_photo
 
 console = Console()
 
-def normalize_scores(burst_photos: list[ScoredPhoto]) -> None:
+def _score_one(info: PhotoInfo, center_weight: float) -> tuple:
     """
-    Normalize sharpness and exposure scores within a burst 
-    so they are on a comparable scale (0.0 to 1.0) before combining.
+    Score a single photo. Returns (sharpness_score, exposure_score).
+
+    Runs as a process-pool worker: thumbnail extraction, JPEG decode and
+    Laplacian scoring are CPU-heavy and independent per photo, and the
+    PIL decode path holds the GIL, so separate processes scale across
+    cores where threads stall. Only the small PhotoInfo record and two
+    floats cross the pickle boundary.
     """
-    if not burst_photos:
-        return
-        
-    sharpness_scores = [p.sharpness_score for p in burst_photos]
-    exposure_scores = [p.exposure_score for p in burst_photos]
-    
-    max_s = max(sharpness_scores) if sharpness_scores else 0
-    min_s = min(sharpness_scores) if sharpness_scores else 0
-    
-    max_e = max(exposure_scores) if exposure_scores else 0
-    min_e = min(exposure_scores) if exposure_scores else 0
-    
-    for p in burst_photos:
-        # Normalize sharpness
-        if max_s > min_s:
-            p.sharpness_score = (p.sharpness_score - min_s) / (max_s - min_s)
-        else:
-            p.sharpness_score = 1.0  # They are all the same
-            
-        # Normalize exposure (already bounded 0-1 from our basic metric, but let's stretch it)
-        if max_e > min_e:
-            p.exposure_score = (p.exposure_score - min_e) / (max_e - min_e)
-        else:
-            p.exposure_score = 1.0
+    # Hopeless EXIF combinations never win a burst; reject them before
+    # paying for preview extraction and decode.
+    if is_unrecoverable(info):
+        return 0.0, 0.0
+
+    ext = info.path.suffix.lower()
+    if ext in RAW_EXTENSIONS:
+        try:
+            # Fast path: read the preview JPEG straight out of the container
+            # without paying for LibRaw initialization.
+            jpeg_bytes = read_embedded_jpeg(info.path)
+        except Exception:
+            with rawpy.imread(str(info.path)) as raw:
+                thumb = raw.extract_thumb()
+                if thumb.format != rawpy.ThumbFormat.JPEG:
+                    return 0.0, 0.0
+                jpeg_bytes = thumb.data
+
+        # Decode to a grayscale array immediately and drop any decoder
+        # state so we never pin dozens of full-res previews in memory.
+        gray = None
+        if _turbojpeg is not None:
+            try:
+                gray = _turbojpeg.decode(jpeg_bytes, pixel_format=TJPF_GRAY)[:, :, 0]
+            except Exception:
+                gray = None
+        if gray is None:
+            with Image.open(io.BytesIO(jpeg_bytes)) as im:
+                gray = np.asarray(im.convert('L'), dtype=np.uint8)
+    else:
+        # Non-raw file, open directly via PIL (handles JPG, WEBP, HEIF)
+        with Image.open(str(info.path)) as img:
+            gray = np.asarray(img.convert('L'), dtype=np.uint8)
+
+    s_score, e_score, _ = score_photo(
+        info,
+        gray,
+        center_weight=center_weight
+    )
+    return s_score, e_score
 
 
 @click.command()
@@ -62,6 +99,7 @@ def normalize_scores(burst_photos: list[ScoredPhoto]) -> None:
 @click.option('--log', is_flag=True, help='Enable writing debug logs to good_birds.log in the target directory')
 @click.option('--exclude-non-raw', is_flag=True, help='Only scan and score RAW files, skipping JPG, HEIF, WEBP.')
 @click.option('--sidecar/--no-sidecar', default=True, help='Write XMP sidecar files (.xmp) for Darktable/RawTherapee/RapidRaw compatibility (default: enabled).')
+@click.option('--cache/--no-cache', 'use_cache', default=True, help='Reuse cached scores and EXIF metadata for unchanged files (default: enabled).')
 def main(
     directory: Path,
     burst_threshold: float,
@@ -74,7 +112,8 @@ def main(
     verbose: bool,
     log: bool,
     exclude_non_raw: bool,
-    sidecar: bool
+    sidecar: bool,
+    use_cache: bool
 ):
     """Good Birds - Sort and rate bird photography RAW bursts."""
     
@@ -104,7 +143,7 @@ def main(
     
     # 1. Scan directory
     with console.status("[bold green]Scanning for RAW & image files..."):
-        photos = scan_directory(directory, exclude_non_raw=exclude_non_raw)
+        photos = scan_directory(directory, exclude_non_raw=exclude_non_raw, use_cache=use_cache)
         
     if not photos:
         console.print("[yellow]No supported RAW files found in directory.[/]")
@@ -115,66 +154,135 @@ def main(
     # 2. Group into bursts
     bursts = group_into_bursts(photos, threshold_seconds=burst_threshold)
     
-    # Filter out single-photo bursts if desired, but for now we'll process all
-    # Just to apply the rating.
-    
+    # Single-photo bursts still get rated, but they skip scoring below.
+
     console.print(f"Grouped into [bold]{len(bursts)}[/] bursts.")
     
-    # 3. Score photos
+    # 3+4. Score photos and write ratings, pipelined: scoring is CPU + file
+    # reads, rating writes are exiftool subprocess I/O — disjoint resources.
+    # A dedicated single writer thread starts rating each burst as soon as
+    # its best photo is known, hiding exiftool latency behind scoring.
     total_photos_to_score = sum(len(b) for b in bursts)
-    
-    with Progress(console=console) as progress:
+
+    score_cache = load_cache(directory) if use_cache else {}
+
+    # Use a single persistent exiftool daemon for the whole write phase instead
+    # of paying a process spawn per photo. Dry runs never touch exiftool.
+    session_ctx = nullcontext() if dry_run else ExifToolSession()
+
+    write_futures = []
+
+    with Progress(console=console) as progress, session_ctx as session, \
+            ThreadPoolExecutor(max_workers=1) as write_pool:
         score_task = progress.add_task("[green]Scoring photos...", total=total_photos_to_score)
-        
+        write_task = progress.add_task("[blue]Writing ratings...", total=total_photos_to_score)
+
+        def _write_burst(burst):
+            """Write ratings for one finished burst (runs on the writer thread)."""
+            best = burst.best_photo
+            for p in burst.photos:
+                rating = rating_best if p is best else rating_rest
+                if session is not None:
+                    success = session.write_rating(p.info.path, rating, sidecar=sidecar)
+                else:
+                    success = write_rating(p.info.path, rating, dry_run=True, sidecar=sidecar)
+                if not success:
+                    logger.error(f"Failed to write rating to {p.info.path.name}")
+                    if verbose:
+                        console.print(f"[red]Failed to write to {p.info.path.name}[/]")
+                progress.advance(write_task)
+
+        def _finalize_burst(burst):
+            """Normalize/combine, pick the best photo, then queue the writes."""
+            if len(burst.photos) > 1:
+                normalize_scores(burst.photos)
+
+                # Compute combined scores and track the argmax in one pass.
+                best = None
+                best_score = -1.0
+                for p in burst.photos:
+                    c = (
+                        p.sharpness_score * sharpness_weight +
+                        p.exposure_score * exposure_weight
+                    )
+                    p.combined_score = c
+                    if c > best_score:
+                        best_score = c
+                        best = p
+
+                if best is not None:
+                    burst.best_photo = best
+
+            write_futures.append(write_pool.submit(_write_burst, burst))
+
+        # Reuse cached scores for unchanged files, only submit the rest.
+        # Bursts with nothing left to score are finalized immediately.
+        to_score = []
+        pending_by_burst = {}
         for burst in bursts:
+            # A single-photo "burst" is trivially its own best photo;
+            # extracting and scoring its preview would be pure waste.
+            if len(burst.photos) == 1:
+                burst.best_photo = burst.photos[0]
+                progress.advance(score_task)
+                _finalize_burst(burst)
+                continue
+
+            pending = 0
             for p in burst.photos:
+                key = cache_key(p.info.path)
+                cached = score_cache.get(key) if key else None
+                if cached is not None:
+                    p.sharpness_score, p.exposure_score = cached
+                    progress.advance(score_task)
+                else:
+                    to_score.append((key, p, burst))
+                    pending += 1
+
+            if pending == 0:
+                _finalize_burst(burst)
+            else:
+                pending_by_burst[id(burst)] = pending
+
+        # Fan scoring out across all cores; each photo is independent.
+        # Workers are processes, so assign results to our own ScoredPhoto,
+        # not the worker's pickled copy.
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+            futures = {
+                pool.submit(_score_one, p.info, center_weight): (key, p, burst)
+                for key, p, burst in to_score
+            }
+            for fut in as_completed(futures):
+                key, photo, burst = futures[fut]
                 try:
-                    ext = p.info.path.suffix.lower()
-                    if ext in ('.cr2', '.cr3', '.nef', '.arw', '.raw'):
-                        with rawpy.imread(str(p.info.path)) as raw:
-                            thumb = raw.extract_thumb()
-                            if thumb.format == rawpy.ThumbFormat.JPEG:
-                                import io
-                                preview_img = Image.open(io.BytesIO(thumb.data))
-                                
-                                s_score, e_score, _ = score_photo(
-                                    p.info, 
-                                    preview_img,
-                                    center_weight=center_weight
-                                )
-                                p.sharpness_score = s_score
-                                p.exposure_score = e_score
-                    else:
-                        # Non-raw file, open directly via PIL (handles JPG, WEBP, HEIF)
-                        with Image.open(str(p.info.path)) as img:
-                            s_score, e_score, _ = score_photo(
-                                p.info, 
-                                img,
-                                center_weight=center_weight
-                            )
-                            p.sharpness_score = s_score
-                            p.exposure_score = e_score
+                    s_score, e_score = fut.result()
+                    photo.sharpness_score = s_score
+                    photo.exposure_score = e_score
+                    if key:
+                        score_cache[key] = (s_score, e_score)
                 except Exception as e:
-                    logger.error(f"Failed to score {p.info.path.name}: {e}", exc_info=True)
+                    logger.error(f"Failed to score {photo.info.path.name}: {e}", exc_info=True)
                     if verbose:
-                        console.print(f"[yellow]Failed to score {p.info.path.name}: {e}[/]")
-                        
+                        console.print(f"[yellow]Failed to score {photo.info.path.name}: {e}[/]")
+
                 progress.advance(score_task)
-                
-            # Normalize and combine within the burst
-            normalize_scores(burst.photos)
-            
-            for p in burst.photos:
-                p.combined_score = (
-                    p.sharpness_score * sharpness_weight + 
-                    p.exposure_score * exposure_weight
-                )
-                
-            # Pick best
-            if burst.photos:
-                burst.best_photo = max(burst.photos, key=lambda p: p.combined_score)
 
-    # 4. Write ratings and show summary
+                # Hand the burst to the writer as soon as its last photo lands
+                pending_by_burst[id(burst)] -= 1
+                if pending_by_burst[id(burst)] == 0:
+                    _finalize_burst(burst)
+
+        # Leaving the write_pool context drains the queued rating writes
+        # before the exiftool session is closed.
+
+    # Surface any unexpected writer-thread failures
+    for fut in write_futures:
+        fut.result()
+
+    if use_cache:
+        save_cache(directory, score_cache)
+
+    # 5. Show summary
     table = Table(title="Burst Summary")
     table.add_column("Burst", justify="right", style="cyan", no_wrap=True)
     table.add_column("Count", justify="right", style="magenta")
@@ -184,33 +292,23 @@ def main(
         table.add_column("Exposure", justify="right")
         table.add_column("Combined", justify="right")
 
-    with Progress(console=console) as progress:
-        write_task = progress.add_task("[blue]Writing ratings...", total=total_photos_to_score)
-        
-        for i, burst in enumerate(bursts, 1):
-            best = burst.best_photo
-            
-            if best:
-                if verbose:
-                    table.add_row(
-                        f"#{i}", 
-                        str(len(burst)), 
-                        best.info.path.name,
-                        f"{best.sharpness_score:.2f}",
-                        f"{best.exposure_score:.2f}",
-                        f"{best.combined_score:.2f}"
-                    )
-                else:
-                    table.add_row(f"#{i}", str(len(burst)), best.info.path.name)
-            
-            for p in burst.photos:
-                rating = rating_best if p is best else rating_rest
-                success = write_rating(p.info.path, rating, dry_run=dry_run, sidecar=sidecar)
-                if not success:
-                    logger.error(f"Failed to write rating to {p.info.path.name}")
-                    if verbose:
-                        console.print(f"[red]Failed to write to {p.info.path.name}[/]")
-                progress.advance(write_task)
+    for i, burst in enumerate(bursts, 1):
+        photos = burst.photos
+        n = len(photos)
+        best = burst.best_photo
+
+        if best:
+            if verbose:
+                table.add_row(
+                    f"#{i}",
+                    str(n),
+                    best.info.path.name,
+                    f"{best.sharpness_score:.2f}",
+                    f"{best.exposure_score:.2f}",
+                    f"{best.combined_score:.2f}"
+                )
+            else:
+                table.add_row(f"#{i}", str(n), best.info.path.name)
 
     logger.info("Scoring and rating completed.")
 
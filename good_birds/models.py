@@ -5,7 +5,18 @@ from typing import List, Optional
 import numpy as np
 
 
-@dataclass
+def _sub_sec_to_us(sub_sec: str) -> int:
+    """
+    Convert an EXIF SubsecTimeOriginal string (fractional seconds, e.g. "50"
+    meaning .50s) into microseconds. Returns 0 for missing/garbage values.
+    """
+    try:
+        return int(sub_sec.ljust(6, '0')[:6])
+    except (ValueError, AttributeError):
+        return 0
+
+
+@dataclass(slots=True)
 class PhotoInfo:
     """Represents metadata and the embedded preview for a single RAW photo."""
     path: Path
@@ -21,12 +32,16 @@ class PhotoInfo:
     # we'll read and process the preview on demand.
     
     @property
-    def full_timestamp_sort_key(self) -> tuple:
-        """Helper to sort photos accurately including sub-second data."""
-        return (self.timestamp, self.sub_sec)
+    def full_timestamp_sort_key(self) -> int:
+        """
+        Timestamp as integer microseconds including sub-second EXIF data.
+        An int key (rather than a (datetime, str) tuple) sorts correctly
+        for multi-digit sub-seconds and feeds straight into numpy argsort.
+        """
+        return int(self.timestamp.timestamp() * 1_000_000) + _sub_sec_to_us(self.sub_sec)
 
 
-@dataclass
+@dataclass(slots=True)
 class ScoredPhoto:
     """A photo that has been scored for sharpness and exposure."""
     info: PhotoInfo
@@ -35,7 +50,7 @@ class ScoredPhoto:
     combined_score: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class Burst:
     """A collection of photos taken in rapid succession."""
     photos: List[ScoredPhoto] = field(default_factory=list)
@@ -0,0 +1,178 @@
+"""
+Fast embedded-JPEG preview extraction.
+
+rawpy's `imread` initializes a full LibRaw decode context even when all we
+want is the embedded preview JPEG. For TIFF-based RAW formats (CR2, NEF, ARW)
+the preview location is recorded in ordinary IFD tags, and for CR3 it lives in
+a PRVW box near the start of the file — so we can pull the bytes out with a
+few targeted reads and no RAW decoding at all. Callers should fall back to
+rawpy if this raises.
+"""
+import logging
+import struct
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# TIFF tags that describe an embedded JPEG preview
+TAG_JPEG_OFFSET = 0x0201   # JPEGInterchangeFormat
+TAG_JPEG_LENGTH = 0x0202   # JPEGInterchangeFormatLength
+TAG_COMPRESSION = 0x0103
+TAG_STRIP_OFFSETS = 0x0111
+TAG_STRIP_BYTE_COUNTS = 0x0117
+TAG_SUB_IFDS = 0x014A
+
+COMPRESSION_OLD_JPEG = 6  # CR2 stores its main preview as "old-style JPEG" strips
+
+JPEG_SOI = b'\xff\xd8'
+
+# The CR3 PRVW box sits before the mdat payload, comfortably within the
+# first few megabytes of the file.
+_CR3_SEARCH_LIMIT = 8 * 1024 * 1024
+
+
+def _read_ifd(f, offset: int, endian: str) -> tuple:
+    """
+    Read one IFD at `offset`. Returns (tags, next_ifd_offset) where tags maps
+    tag id -> scalar value for inline SHORT/LONG entries, and tag id ->
+    (count, value_or_offset) for SubIFD pointer arrays.
+    """
+    f.seek(offset)
+    raw_count = f.read(2)
+    if len(raw_count) < 2:
+        return {}, 0
+    (count,) = struct.unpack(endian + 'H', raw_count)
+    if count == 0 or count > 512:
+        # Either empty or we're reading garbage; bail out.
+        return {}, 0
+
+    data = f.read(count * 12 + 4)
+    if len(data) < count * 12 + 4:
+        return {}, 0
+
+    tags = {}
+    for i in range(count):
+        entry = data[i * 12:(i + 1) * 12]
+        tag, typ, num = struct.unpack(endian + 'HHI', entry[:8])
+
+        if tag == TAG_SUB_IFDS and typ == 4:
+            (value,) = struct.unpack(endian + 'I', entry[8:12])
+            tags[tag] = (num, value)
+        elif typ == 3 and num == 1:    # SHORT
+            (value,) = struct.unpack(endian + 'H', entry[8:10])
+            tags[tag] = value
+        elif typ == 4 and num == 1:    # LONG
+            (value,) = struct.unpack(endian + 'I', entry[8:12])
+            tags[tag] = value
+
+    (next_ifd,) = struct.unpack(endian + 'I', data[count * 12:count * 12 + 4])
+    return tags, next_ifd
+
+
+def _tiff_preview_candidates(f) -> list:
+    """
+    Walk the IFD chain (including SubIFDs) of a TIFF-based RAW and collect
+    every (offset, length) pair that looks like an embedded JPEG.
+    """
+    f.seek(0)
+    header = f.read(8)
+    if header[:4] == b'II*\x00':
+        endian = '<'
+    elif header[:4] == b'MM\x00*':
+        endian = '>'
+    else:
+        raise ValueError("Not a TIFF-based RAW file")
+
+    (first_ifd,) = struct.unpack(endian + 'I', header[4:8])
+
+    candidates = []
+    queue = [first_ifd]
+    seen = set()
+
+    while queue and len(seen) < 32:
+        offset = queue.pop()
+        if not offset or offset in seen:
+            continue
+        seen.add(offset)
+
+        tags, next_ifd = _read_ifd(f, offset, endian)
+        queue.append(next_ifd)
+
+        # Standard preview tags (thumbnail IFDs, NEF/ARW preview SubIFDs)
+        if TAG_JPEG_OFFSET in tags and TAG_JPEG_LENGTH in tags:
+            candidates.append((tags[TAG_JPEG_OFFSET], tags[TAG_JPEG_LENGTH]))
+
+        # CR2 stores its big preview as a single old-style-JPEG strip in IFD0
+        if (tags.get(TAG_COMPRESSION) == COMPRESSION_OLD_JPEG
+                and TAG_STRIP_OFFSETS in tags and TAG_STRIP_BYTE_COUNTS in tags
+                and not isinstance(tags[TAG_STRIP_OFFSETS], tuple)):
+            candidates.append((tags[TAG_STRIP_OFFSETS], tags[TAG_STRIP_BYTE_COUNTS]))
+
+        # Follow SubIFD pointers (NEF/ARW keep previews there)
+        if TAG_SUB_IFDS in tags:
+            num, value = tags[TAG_SUB_IFDS]
+            if num == 1:
+                queue.append(value)
+            else:
+                f.seek(value)
+                raw = f.read(num * 4)
+                if len(raw) == num * 4:
+                    queue.extend(struct.unpack(endian + f'{num}I', raw))
+
+    return candidates
+
+
+def _read_cr3_preview(f) -> bytes:
+    """
+    Extract the PRVW JPEG from a CR3 (ISO-BMFF) file.
+
+    Layout after the 'PRVW' box tag: 4 bytes unknown, u16 unknown, u16 width,
+    u16 height, u16 unknown, u32 big-endian JPEG size, then the JPEG data.
+    """
+    f.seek(0)
+    data = f.read(_CR3_SEARCH_LIMIT)
+
+    idx = data.find(b'PRVW')
+    if idx == -1 or idx + 20 > len(data):
+        raise ValueError("No PRVW box found in CR3 file")
+
+    (jpeg_size,) = struct.unpack_from('>I', data, idx + 16)
+    start = idx + 20
+
+    jpeg = data[start:start + jpeg_size]
+    if len(jpeg) < jpeg_size:
+        # Preview extends past our search window; read the rest directly.
+        jpeg += f.read(jpeg_size - len(jpeg))
+
+    return jpeg
+
+
+def read_embedded_jpeg(path: Path) -> bytes:
+    """
+    Return the largest embedded preview JPEG from a RAW file as bytes.
+
+    Handles TIFF-based containers (CR2, NEF, ARW) by walking IFDs for the
+    JPEGInterchangeFormat tags, and CR3 via its PRVW box. Raises ValueError
+    if no valid preview is found, in which case the caller should fall back
+    to rawpy.
+    """
+    with open(path, 'rb') as f:
+        if path.suffix.lower() == '.cr3':
+            jpeg = _read_cr3_preview(f)
+            if not jpeg.startswith(JPEG_SOI):
+                raise ValueError(f"CR3 PRVW data in {path.name} is not a JPEG")
+            return jpeg
+
+        candidates = _tiff_preview_candidates(f)
+
+        # Prefer the largest preview: thumbnail IFDs also match these tags
+        # but a 160x120 thumb is useless for sharpness scoring.
+        for offset, length in sorted(candidates, key=lambda c: c[1], reverse=True):
+            if length < 4:
+                continue
+            f.seek(offset)
+            jpeg = f.read(length)
+            if jpeg.startswith(JPEG_SOI):
+                return jpeg
+
+    raise ValueError(f"No embedded JPEG preview found in {path.name}")
@@ -1,3 +1,4 @@
+import functools
 import os
 import sys
 import subprocess
@@ -17,10 +18,14 @@ RATING_TO_PERCENT = {
     5: 99,
 }
 
-def get_exiftool_cmd() -> list[str] | None:
+@functools.lru_cache(maxsize=1)
+def get_exiftool_cmd() -> tuple[str, ...] | None:
     """
-    Get the command array to run exiftool. 
+    Get the command tuple to run exiftool.
     Checks the bundled PyInstaller _MEIPASS directory first, then the system PATH.
+
+    The lookup involves filesystem checks and a PATH scan, so the result is
+    memoized — the binary location doesn't change while we run.
     """
     # Check if bundled in PyInstaller
     if getattr(sys, 'frozen', False) and hasattr(sys, '_MEIPASS'):
@@ -30,17 +35,17 @@ def get_exiftool_cmd() -> list[str] | None:
         
         # Bypass exiftool.exe wrapper to avoid environment/PATH bugs.
         if os.path.exists(perl_exe) and os.path.exists(exiftool_pl):
-            return [perl_exe, exiftool_pl]
+            return (perl_exe, exiftool_pl)
             
     # Check if running from source with a downloaded binary
     local_exiftool = Path(__file__).parent / "exiftool.exe"
     if local_exiftool.exists():
-        return [str(local_exiftool)]
+        return (str(local_exiftool),)
             
     # Fallback to system path
     exe_path = shutil.which("exiftool")
     if exe_path:
-        return [exe_path]
+        return (exe_path,)
     return None
 
 def is_exiftool_installed() -> bool:
@@ -80,6 +85,157 @@ def write_xmp_sidecar(file_path: Path, rating: int) -> bool:
         return False
 
 
+def write_ratings(items, dry_run: bool = False, sidecar: bool = True) -> int:
+    """
+    Write star ratings for many files, batching into one exiftool invocation
+    per distinct rating value (the tag arguments are identical within a group,
+    and exiftool accepts any number of target files per run).
+
+    `items` is an iterable of (path, rating) pairs. This amortizes Perl
+    startup like ExifToolSession but without keeping a daemon around, which
+    suits one-shot scripted use. Returns the number of files written.
+    """
+    items = list(items)
+
+    if dry_run:
+        for file_path, rating in items:
+            print(f"[DRY RUN] Would write rating {rating} to {file_path.name}")
+        return len(items)
+
+    exiftool_cmd = get_exiftool_cmd()
+    if not exiftool_cmd:
+        print("Error: exiftool is not installed, bundled, or not in PATH.")
+        return 0
+
+    grouped = {}
+    for file_path, rating in items:
+        grouped.setdefault(rating, []).append(file_path)
+
+    written = 0
+    for rating, paths in grouped.items():
+        rating_percent = RATING_TO_PERCENT.get(rating, 0)
+        cmd = list(exiftool_cmd) + [
+            "-overwrite_original",
+            f"-XMP:Rating={rating}",
+            f"-XMP:RatingPercent={rating_percent}",
+            f"-Rating={rating}",
+            *(str(p) for p in paths)
+        ]
+
+        try:
+            subprocess.run(
+                cmd,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                check=True
+            )
+        except subprocess.CalledProcessError as e:
+            stderr = e.stderr.decode('utf-8', 'replace') if isinstance(e.stderr, bytes) else e.stderr
+            print(f"Error writing rating {rating} batch ({len(paths)} files): {stderr}")
+            continue
+
+        if sidecar:
+            for file_path in paths:
+                write_xmp_sidecar(file_path, rating)
+
+        written += len(paths)
+
+    return written
+
+
+class ExifToolSession:
+    """
+    A persistent exiftool process using the -stay_open protocol.
+
+    Spawning exiftool costs ~200-300 ms of Perl startup per invocation, which
+    dominates runtime when rating hundreds of photos one by one. With
+    `-stay_open True -@ -` a single daemon process stays alive and receives
+    per-file argument blocks over stdin, so N writes cost one process spawn.
+
+    Use as a context manager:
+
+        with ExifToolSession() as session:
+            for path, rating in items:
+                session.write_rating(path, rating)
+    """
+
+    def __init__(self):
+        self._proc = None
+
+    def __enter__(self) -> "ExifToolSession":
+        exiftool_cmd = get_exiftool_cmd()
+        if not exiftool_cmd:
+            raise RuntimeError("exiftool is not installed, bundled, or not in PATH.")
+
+        self._proc = subprocess.Popen(
+            list(exiftool_cmd) + ["-stay_open", "True", "-@", "-"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True
+        )
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _execute(self, args: list[str]) -> str:
+        """Send one argument block and read output until the {ready} marker."""
+        self._proc.stdin.write("\n".join(args) + "\n-execute\n")
+        self._proc.stdin.flush()
+
+        output_lines = []
+        while True:
+            line = self._proc.stdout.readline()
+            if not line or line.strip() == "{ready}":
+                break
+            output_lines.append(line)
+        return "".join(output_lines)
+
+    def write_rating(self, file_path: Path, rating: int, sidecar: bool = True) -> bool:
+        """
+        Write star rating metadata to a file through the persistent session.
+
+        Sets the same three tags as the standalone `write_rating` function and
+        optionally writes the XMP sidecar. Returns True if successful.
+        """
+        rating_percent = RATING_TO_PERCENT.get(rating, 0)
+
+        try:
+            output = self._execute([
+                "-overwrite_original",
+                f"-XMP:Rating={rating}",
+                f"-XMP:RatingPercent={rating_percent}",
+                f"-Rating={rating}",
+                str(file_path)
+            ])
+        except (OSError, BrokenPipeError) as e:
+            print(f"Error writing to {file_path.name}: {e}")
+            return False
+
+        # exiftool reports failures as "Error: ..." lines on stdout
+        if "error" in output.lower():
+            print(f"Error writing to {file_path.name}: {output.strip()}")
+            return False
+
+        if sidecar:
+            write_xmp_sidecar(file_path, rating)
+
+        return True
+
+    def close(self) -> None:
+        """Shut down the exiftool daemon gracefully."""
+        if self._proc is None:
+            return
+        try:
+            self._proc.stdin.write("-stay_open\nFalse\n")
+            self._proc.stdin.flush()
+            self._proc.wait(timeout=10)
+        except Exception:
+            self._proc.kill()
+        self._proc = None
+
+
 def write_rating(file_path: Path, rating: int, dry_run: bool = False, sidecar: bool = True) -> bool:
     """
     Write star rating metadata to a file using exiftool and an XMP sidecar.
@@ -110,7 +266,7 @@ def write_rating(file_path: Path, rating: int, dry_run: bool = False, sidecar: b
         # Construct exact command array.
         # -overwrite_original prevents creating a _original backup file
         # Three tags for full compatibility with Windows, DigiKam, Lightroom, etc.
-        cmd = exiftool_cmd + [
+        cmd = list(exiftool_cmd) + [
             "-overwrite_original", 
             f"-XMP:Rating={rating}",
             f"-XMP:RatingPercent={rating_percent}",
@@ -118,12 +274,12 @@ def write_rating(file_path: Path, rating: int, dry_run: bool = False, sidecar: b
             str(file_path)
         ]
         
-        # Run silently unless there's an error
+        # Run silently unless there's an error. Discard stdout at the fd level
+        # instead of piping and decoding exiftool's success chatter per call.
         result = subprocess.run(
-            cmd, 
-            stdout=subprocess.PIPE, 
+            cmd,
+            stdout=subprocess.DEVNULL,
             stderr=subprocess.PIPE,
-            text=True,
             check=True
         )
         
@@ -134,7 +290,9 @@ def write_rating(file_path: Path, rating: int, dry_run: bool = False, sidecar: b
         return True
         
     except subprocess.CalledProcessError as e:
-        print(f"Error writing to {file_path.name}: {e.stderr}")
+        # stderr is raw bytes now; only decode it on the failure path
+        stderr = e.stderr.decode('utf-8', 'replace') if isinstance(e.stderr, bytes) else e.stderr
+        print(f"Error writing to {file_path.name}: {stderr}")
         return False
     except Exception as e:
         print(f"Unexpected error writing to {file_path.name}: {e}")
@@ -1,9 +1,15 @@
 import datetime
+import io
+import json
 import logging
+import os
 import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Iterable, List, Optional
 
+import numpy as np
 import rawpy
 from PIL import Image, ExifTags
 
@@ -13,38 +19,112 @@ try:
 except ImportError:
     pass
 
+try:
+    import piexif
+except ImportError:
+    piexif = None
+
+from .cache import load_exif_cache, save_exif_cache
 from .models import PhotoInfo
 from .rating import get_exiftool_cmd
 
 logger = logging.getLogger(__name__)
 
-# Standard RAW formats we support
-RAW_EXTENSIONS = ('.cr2', '.cr3', '.nef', '.arw', '.raw')
+# Standard formats we support, lowercase, as frozensets: membership checks
+# run once per directory entry, and a hashed lookup beats a linear scan
+# over a tuple.
+RAW_EXTENSIONS = frozenset({'.cr2', '.cr3', '.nef', '.arw', '.raw'})
 # Standard non-RAW image formats we support mapping metadata for natively
-NON_RAW_EXTENSIONS = ('.jpg', '.jpeg', '.heif', '.heic', '.webp')
+NON_RAW_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.heif', '.heic', '.webp'})
+
+# The only EXIF tags the scanners read downstream; precompute their ids so
+# get_exif_data does a handful of O(1) lookups instead of name-mapping every
+# tag in the file.
+_WANTED_TAG_IDS = {
+    tag_id: name
+    for tag_id, name in ExifTags.TAGS.items()
+    if name in ("DateTimeOriginal", "SubsecTimeOriginal", "ISOSpeedRatings",
+                "ExposureTime", "FNumber")
+}
+
+def _parse_exif_dt(dt_str: str) -> datetime.datetime:
+    """
+    Parse an EXIF "YYYY:MM:DD HH:MM:SS" timestamp by slicing fixed offsets.
+    The format is rigid, so this avoids strptime, which re-interprets its
+    format string on every call and dominates the per-row cost on large
+    directories. Raises ValueError on malformed input, same as strptime.
+    """
+    return datetime.datetime(
+        int(dt_str[0:4]), int(dt_str[5:7]), int(dt_str[8:10]),
+        int(dt_str[11:13]), int(dt_str[14:16]), int(dt_str[17:19])
+    )
 
 def get_exif_data(image: Image.Image) -> dict:
-    """Extract EXIF data into a more readable dictionary."""
+    """Extract the EXIF tags we care about into a readable dictionary."""
     exif_data = {}
     exif = image.getexif()
     if exif is None:
         return exif_data
-        
-    for tag_id, value in exif.items():
-        tag = ExifTags.TAGS.get(tag_id, tag_id)
-        exif_data[tag] = value
-        
-    # Also get IFD data (where the valuable stuff often hides in JPEGs)
-    ifd = exif.get_ifd(ExifTags.IFD.Exif)
-    for tag_id, value in ifd.items():
-        tag = ExifTags.TAGS.get(tag_id, tag_id)
-        exif_data[tag] = value
-        
+
+    # One merge of the root IFD with the Exif sub-IFD (where the valuable
+    # stuff often hides in JPEGs), instead of two Python-level loops over
+    # every tag in the file.
+    merged = {**exif, **exif.get_ifd(ExifTags.IFD.Exif)}
+    for tag_id, name in _WANTED_TAG_IDS.items():
+        if tag_id in merged:
+            exif_data[name] = merged[tag_id]
+
     return exif_data
 
-def scan_file(file_path: Path) -> Optional[PhotoInfo]:
+def _exif_via_piexif(jpeg_bytes: bytes) -> Optional[dict]:
+    """
+    Parse the APP1 EXIF segment of a JPEG directly with piexif, skipping
+    PIL's image decoder (Image.open still parses SOI/quantization/Huffman
+    tables just to reach the EXIF block). Returns a dict shaped like
+    get_exif_data, or None if piexif is unavailable or parsing fails so the
+    caller can fall back to PIL.
+    """
+    if piexif is None:
+        return None
+
+    try:
+        raw = piexif.load(jpeg_bytes)
+    except Exception:
+        return None
+
+    exif_ifd = raw.get("Exif", {})
+    out = {}
+
+    def _ascii(value):
+        return value.decode('ascii', 'replace') if isinstance(value, bytes) else value
+
+    dt = exif_ifd.get(piexif.ExifIFD.DateTimeOriginal)
+    if dt:
+        out["DateTimeOriginal"] = _ascii(dt)
+
+    sub_sec = exif_ifd.get(piexif.ExifIFD.SubSecTimeOriginal)
+    if sub_sec:
+        out["SubsecTimeOriginal"] = _ascii(sub_sec)
+
+    iso = exif_ifd.get(piexif.ExifIFD.ISOSpeedRatings)
+    if iso is not None:
+        out["ISOSpeedRatings"] = iso[0] if isinstance(iso, (tuple, list)) else iso
+
+    # Rationals come back as (numerator, denominator) pairs
+    exp = exif_ifd.get(piexif.ExifIFD.ExposureTime)
+    if isinstance(exp, tuple) and len(exp) == 2 and exp[1]:
+        out["ExposureTime"] = exp[0] / exp[1]
+
+    fnum = exif_ifd.get(piexif.ExifIFD.FNumber)
+    if fnum is not None:
+        out["FNumber"] = fnum
+
+    return out
+
+def scan_file(file_path: Path, stat_result: Optional[os.stat_result] = None) -> Optional[PhotoInfo]:
     """
     Scan a single RAW file to extract metadata without fully decoding the RAW image data.
+    Pass `stat_result` (e.g. from os.scandir) to avoid a redundant stat() call.
     """
     try:
         with rawpy.imread(str(file_path)) as raw:
@@ -53,12 +133,12 @@ def scan_file(file_path: Path) -> Optional[PhotoInfo]:
                 # For CR2, rawpy can usually extract the JPEG preview
                 thumb = raw.extract_thumb()
                 if thumb.format == rawpy.ThumbFormat.JPEG:
-                    # Load from bytes
-                    import io
-                    preview_img = Image.open(io.BytesIO(thumb.data))
-                    
-                    # Extract EXIF from this embedded preview
-                    exif = get_exif_data(preview_img)
+                    # Read EXIF straight from the APP1 segment; only decode
+                    # the preview with PIL if direct parsing fails.
+                    exif = _exif_via_piexif(thumb.data)
+                    if exif is None:
+                        preview_img = Image.open(io.BytesIO(thumb.data))
+                        exif = get_exif_data(preview_img)
                     
                     # Parse interesting fields
                     dt_orig_str = exif.get("DateTimeOriginal")
@@ -66,14 +146,14 @@ def scan_file(file_path: Path) -> Optional[PhotoInfo]:
                     
                     if not dt_orig_str:
                         # Fallback to file modified time if EXIF is missing
-                        mtime = file_path.stat().st_mtime
+                        mtime = (stat_result or file_path.stat()).st_mtime
                         dt_orig = datetime.datetime.fromtimestamp(mtime)
                     else:
                         # EXIF format is usually "YYYY:MM:DD HH:MM:SS"
                         try:
-                            dt_orig = datetime.datetime.strptime(dt_orig_str, "%Y:%m:%d %H:%M:%S")
+                            dt_orig = _parse_exif_dt(dt_orig_str)
                         except ValueError:
-                            mtime = file_path.stat().st_mtime
+                            mtime = (stat_result or file_path.stat()).st_mtime
                             dt_orig = datetime.datetime.fromtimestamp(mtime)
                             
                     iso = exif.get("ISOSpeedRatings")
@@ -115,9 +195,10 @@ def scan_file(file_path: Path) -> Optional[PhotoInfo]:
         
     return None
 
-def scan_standard_file(file_path: Path) -> Optional[PhotoInfo]:
+def scan_standard_file(file_path: Path, stat_result: Optional[os.stat_result] = None) -> Optional[PhotoInfo]:
     """
     Fallback scanner for non-RAW files using PIL directly.
+    Pass `stat_result` (e.g. from os.scandir) to avoid a redundant stat() call.
     """
     try:
         with Image.open(file_path) as img:
@@ -127,13 +208,13 @@ def scan_standard_file(file_path: Path) -> Optional[PhotoInfo]:
             sub_sec_str = exif.get("SubsecTimeOriginal", "00")
             
             if not dt_orig_str:
-                mtime = file_path.stat().st_mtime
+                mtime = (stat_result or file_path.stat()).st_mtime
                 dt_orig = datetime.datetime.fromtimestamp(mtime)
             else:
                 try:
-                    dt_orig = datetime.datetime.strptime(dt_orig_str, "%Y:%m:%d %H:%M:%S")
+                    dt_orig = _parse_exif_dt(dt_orig_str)
                 except ValueError:
-                    mtime = file_path.stat().st_mtime
+                    mtime = (stat_result or file_path.stat()).st_mtime
                     dt_orig = datetime.datetime.fromtimestamp(mtime)
                     
             iso = exif.get("ISOSpeedRatings")
@@ -169,136 +250,216 @@ def scan_standard_file(file_path: Path) -> Optional[PhotoInfo]:
     return None
 
 def scan_directory(
-    directory: Path, 
-    extensions: Tuple[str, ...] = RAW_EXTENSIONS,
-    exclude_non_raw: bool = False
+    directory: Path,
+    extensions: Iterable[str] = RAW_EXTENSIONS,
+    exclude_non_raw: bool = False,
+    max_concurrency: int = 8,
+    use_cache: bool = True
 ) -> List[PhotoInfo]:
-    """Scan a directory for supported raw files using exiftool (if available) for batch extraction."""
-    
-    # Determine the full suite of extensions we are looking for
-    target_extensions = list(extensions)
-    if not exclude_non_raw:
-        target_extensions.extend(NON_RAW_EXTENSIONS)
-    
-    logger.info(f"Scanning directory {directory} for extensions {target_extensions}")
+    """
+    Scan a directory for supported raw files using exiftool (if available)
+    for batch extraction. Per-file fallback scanning runs on up to
+    `max_concurrency` threads. Scanned metadata is cached on disk keyed by
+    (path, mtime, size), so unchanged files skip extraction entirely on
+    re-runs; pass `use_cache=False` to force a full rescan.
+    """
+    # Normalize caller-supplied extensions once, so the per-file checks
+    # below are plain frozenset lookups with no casing surprises.
+    extensions = frozenset(e.lower() for e in extensions)
+
+    logger.info(f"Scanning directory {directory} (exclude_non_raw={exclude_non_raw})")
     photos = []
-    
+
+    # 1. One scandir pass: DirEntry caches the stat result from the
+    # directory read, so we never issue a separate stat() syscall per file,
+    # and bucketing RAW vs non-RAW entries here means the lowercased suffix
+    # is computed exactly once per file instead of once per pass.
+    candidates = []
+    non_raw = []
+    raw_stems = set()
+    with os.scandir(directory) as it:
+        for entry in it:
+            if not entry.is_file(follow_symlinks=False):
+                continue
+            file_path = Path(entry.path)
+            ext = file_path.suffix.lower()
+            if ext in extensions:
+                raw_stems.add(file_path.stem)
+                candidates.append((file_path, entry.stat()))
+            elif not exclude_non_raw and ext in NON_RAW_EXTENSIONS:
+                non_raw.append((file_path, entry.stat()))
+
+    # 2. Admit non-RAW files only when no RAW sibling exists. This prevents
+    # us from scoring IMG_1234.JPG if IMG_1234.CR2 exists.
+    for file_path, st in non_raw:
+        if file_path.stem in raw_stems:
+            logger.debug(f"Skipping {file_path.name} because matching RAW was found.")
+            continue
+        candidates.append((file_path, st))
+
+    # 3. Satisfy what we can from the on-disk EXIF cache. An entry is fresh
+    # only if mtime and size still match; stale entries fall through to a
+    # normal scan and get replaced on save.
+    exif_cache = load_exif_cache(directory) if use_cache else {}
+    misses = []
+    for file_path, st in candidates:
+        hit = exif_cache.get(str(file_path))
+        if hit and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+            photos.append(hit[2])
+        else:
+            misses.append((file_path, st))
+
+    if photos:
+        logger.info(f"Reused cached EXIF for {len(photos)} unchanged files.")
+
     cmd = get_exiftool_cmd()
     exif_data_by_file = {}
-    
-    if cmd:
+
+    # Exactly the cache misses we want exiftool to read, listed via an
+    # argfile instead of letting it walk the directory itself.
+    exiftool_targets = [f for f, _ in misses]
+
+    if cmd and exiftool_targets:
         logger.info("Exiftool found. Running batch EXIF extraction...")
-        # Build ext arguments
-        ext_args = []
-        for ext in target_extensions:
-            ext_args.extend(["-ext", ext.lstrip('.')])
-            
-        exif_cmd = cmd + [
-            "-T", 
-            "-filename", 
-            "-datetimeoriginal", 
-            "-subsectimeoriginal", 
-            "-iso", 
-            "-exposuretime", 
-            "-fnumber",
-            *ext_args,
-            str(directory)
-        ]
-        
+        argfile = None
         try:
-            result = subprocess.run(exif_cmd, capture_output=True, text=True, check=True)
-            for line in result.stdout.splitlines():
-                parts = line.split('\t')
-                if len(parts) >= 6:
-                    filename, dt, subsec, iso, exp, fnum = parts[:6]
-                    exif_data_by_file[filename] = {
-                        "datetime": dt,
-                        "subsec": subsec,
-                        "iso": iso,
-                        "exposure": exp,
-                        "fnumber": fnum
-                    }
-            logger.info(f"Batch extracted EXIF for {len(exif_data_by_file)} files via exiftool.")
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Exiftool batch extraction failed: {e.stderr[:200]}")
-            logger.info("Falling back to rawpy extraction for all files.")
+            with tempfile.NamedTemporaryFile(
+                'w', suffix='.txt', delete=False, encoding='utf-8'
+            ) as tf:
+                tf.write("\n".join(str(f) for f in exiftool_targets))
+                argfile = tf.name
+
+            exif_cmd = list(cmd) + [
+                "-fast2",          # stop at the EXIF segment, don't scan whole RAWs
+                "-q", "-q", "-m",  # quiet output, ignore minor errors
+                "-charset", "filename=utf8",
+                "-json", "-n",     # typed numeric output, no "-" placeholders
+                "-filename",
+                "-datetimeoriginal",
+                "-subsectimeoriginal",
+                "-iso",
+                "-exposuretime",
+                "-fnumber",
+                "-@", argfile
+            ]
+
+            # -json/-n gives us typed values straight from exiftool: absent
+            # tags are simply missing keys and numerics arrive as numbers,
+            # so no "-" placeholder or isdigit churn per row. json.load
+            # consumes the pipe directly rather than buffering a string copy.
+            proc = subprocess.Popen(
+                exif_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                text=True
+            )
+            try:
+                rows = json.load(proc.stdout)
+            except ValueError:
+                rows = []
+            for row in rows:
+                filename = row.get("FileName")
+                if filename:
+                    exif_data_by_file[filename] = row
+            stderr = proc.stderr.read()
+            if proc.wait() != 0:
+                logger.error(f"Exiftool batch extraction failed: {stderr[:200]}")
+                logger.info("Falling back to rawpy extraction for all files.")
+                exif_data_by_file.clear()
+            else:
+                logger.info(f"Batch extracted EXIF for {len(exif_data_by_file)} files via exiftool.")
         except Exception as e:
             logger.error(f"Unexpected error running exiftool: {str(e)}")
-    else:
+        finally:
+            if argfile:
+                try:
+                    os.unlink(argfile)
+                except OSError:
+                    pass
+    elif not cmd:
         logger.warning("Exiftool not found, falling back to rawpy preview EXIF extraction.")
 
-    # 1. First pass: look at all files to build a set of RAW files
-    # This prevents us from scoring IMG_1234.JPG if IMG_1234.CR2 exists.
-    raw_stems = set()
-    all_files = list(directory.iterdir())
-    
-    for file_path in all_files:
-        if not file_path.is_file():
-            continue
-        if file_path.suffix.lower() in extensions:
-            raw_stems.add(file_path.stem)
+    # 4. Build PhotoInfo objects for the misses.
+    # The per-file fallback (rawpy/PIL) is I/O-bound, so misses are
+    # scanned on a thread pool; disk reads overlap with JPEG/EXIF decode.
+    def _scan_one(candidate) -> Optional[PhotoInfo]:
+        file_path, st = candidate
+        filename = file_path.name
 
-    # Iterate directory and build PhotoInfo objects
-    for file_path in all_files:
-        if not file_path.is_file():
-            continue
-            
-        ext = file_path.suffix.lower()
-        if ext in target_extensions:
-            # Skip if it is a NON-RAW but we have the RAW
-            if ext in NON_RAW_EXTENSIONS and file_path.stem in raw_stems:
-                logger.debug(f"Skipping {file_path.name} because matching RAW was found.")
-                continue
-            info = None
-            filename = file_path.name
-            
-            if filename in exif_data_by_file:
-                # Parse from exiftool output
-                data = exif_data_by_file[filename]
-                dt_str = data["datetime"]
-                
-                if dt_str and dt_str != "-":
-                    try:
-                        timestamp = datetime.datetime.strptime(dt_str, "%Y:%m:%d %H:%M:%S")
-                    except ValueError:
-                        timestamp = datetime.datetime.fromtimestamp(file_path.stat().st_mtime)
-                else:
-                    timestamp = datetime.datetime.fromtimestamp(file_path.stat().st_mtime)
-                    logger.warning(f"No DateTimeOriginal for {filename}, using fallback mtime.")
-                    
-                subsec_str = data["subsec"] if data["subsec"] != "-" else "00"
-                iso_val = int(data["iso"]) if data["iso"] != "-" and data["iso"].isdigit() else None
-                
-                exp_str = data["exposure"] if data["exposure"] != "-" else None
-                
-                fnum_val = None
-                if data["fnumber"] != "-":
-                    try:
-                        fnum_val = float(data["fnumber"])
-                    except ValueError:
-                        pass
-                
-                info = PhotoInfo(
-                    path=file_path,
-                    timestamp=timestamp,
-                    sub_sec=subsec_str,
-                    iso=iso_val,
-                    shutter_speed=exp_str,
-                    aperture=fnum_val
-                )
+        if filename in exif_data_by_file:
+            # Parse from exiftool's JSON output; -n already delivered
+            # numerics as numbers and missing tags as missing keys.
+            data = exif_data_by_file[filename]
+            dt_str = data.get("DateTimeOriginal")
+
+            if dt_str:
+                try:
+                    timestamp = _parse_exif_dt(dt_str)
+                except ValueError:
+                    timestamp = datetime.datetime.fromtimestamp(st.st_mtime)
             else:
-                # Use fallback
-                logger.debug(f"Exiftool data not found for {filename}, falling back to manual scan.")
-                if ext in extensions:
-                    info = scan_file(file_path)
-                else:
-                    info = scan_standard_file(file_path)
-                
-            if info:
-                photos.append(info)
-                
+                timestamp = datetime.datetime.fromtimestamp(st.st_mtime)
+                logger.warning(f"No DateTimeOriginal for {filename}, using fallback mtime.")
+
+            # Keep sub-seconds as the string the rest of the pipeline
+            # expects; exiftool may emit it numerically under -n.
+            subsec = data.get("SubSecTimeOriginal")
+            subsec_str = str(subsec) if subsec is not None else "00"
+
+            iso_val = data.get("ISO")
+            if iso_val is not None:
+                try:
+                    iso_val = int(iso_val)
+                except (TypeError, ValueError):
+                    iso_val = None
+
+            # ExposureTime is numeric seconds under -n; render it the same
+            # way the rawpy/PIL fallbacks do.
+            exposure = data.get("ExposureTime")
+            exp_str = None
+            if isinstance(exposure, (int, float)) and exposure > 0:
+                exp_str = f"1/{int(1 / exposure)}" if exposure < 1 else f"{exposure}s"
+
+            fnum_val = data.get("FNumber")
+            if fnum_val is not None:
+                try:
+                    fnum_val = float(fnum_val)
+                except (TypeError, ValueError):
+                    fnum_val = None
+
+            return PhotoInfo(
+                path=file_path,
+                timestamp=timestamp,
+                sub_sec=subsec_str,
+                iso=iso_val,
+                shutter_speed=exp_str,
+                aperture=fnum_val
+            )
+
+        # Use fallback
+        logger.debug(f"Exiftool data not found for {filename}, falling back to manual scan.")
+        if file_path.suffix.lower() in extensions:
+            return scan_file(file_path, stat_result=st)
+        return scan_standard_file(file_path, stat_result=st)
+
+    if misses:
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(misses))) as executor:
+            scanned = list(executor.map(_scan_one, misses))
+
+        new_entries = [
+            (file_path, st, info)
+            for (file_path, st), info in zip(misses, scanned)
+            if info
+        ]
+        photos.extend(info for _, _, info in new_entries)
+        if use_cache:
+            save_exif_cache(directory, new_entries)
+
     logger.info(f"Successfully scanned {len(photos)} supported files.")
     
-    # Sort them chronologically
-    photos.sort(key=lambda p: p.full_timestamp_sort_key)
-    return photos
+    # Sort them chronologically: one vectorized argsort over an int64 key
+    # array instead of a Python lambda call per comparison element.
+    keys = np.fromiter(
+        (p.full_timestamp_sort_key for p in photos),
+        dtype=np.int64,
+        count=len(photos)
+    )
+    return [photos[i] for i in np.argsort(keys, kind='stable')]
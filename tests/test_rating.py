@@ -3,7 +3,13 @@ from unittest.mock import patch, MagicMock
 
 import pytest
 
-from good_birds.rating import write_rating, write_xmp_sidecar, is_exiftool_installed
+from good_birds.rating import (
+    ExifToolSession,
+    write_rating,
+    write_ratings,
+    write_xmp_sidecar,
+    is_exiftool_installed,
+)
 
 def test_dry_run(capsys, tmp_path):
     dummy = tmp_path / "dummy.CR2"
@@ -123,6 +129,101 @@ def test_write_xmp_sidecar_overwrites(tmp_path):
     assert 'xmp:Rating="5"' in content2
     assert 'xmp:Rating="1"' not in content2
     
+# --- Batch write_ratings Tests ---
+
+@patch("good_birds.rating.get_exiftool_cmd", return_value=["exiftool"])
+@patch("good_birds.rating.subprocess.run")
+def test_write_ratings_groups_by_rating(mock_run, mock_get_cmd, tmp_path):
+    mock_run.return_value = MagicMock(returncode=0)
+
+    files = []
+    for name, rating in [("a.CR2", 5), ("b.CR2", 1), ("c.CR2", 1)]:
+        f = tmp_path / name
+        f.touch()
+        files.append((f, rating))
+
+    written = write_ratings(files)
+
+    assert written == 3
+    # One exiftool invocation per distinct rating value
+    assert mock_run.call_count == 2
+
+    all_args = [c[0][0] for c in mock_run.call_args_list]
+    five_star = next(a for a in all_args if "-XMP:Rating=5" in a)
+    one_star = next(a for a in all_args if "-XMP:Rating=1" in a)
+    assert str(tmp_path / "a.CR2") in five_star
+    assert str(tmp_path / "b.CR2") in one_star
+    assert str(tmp_path / "c.CR2") in one_star
+
+    # Sidecars for every file
+    for name in ("a.CR2", "b.CR2", "c.CR2"):
+        assert (tmp_path / f"{name}.xmp").exists()
+
+def test_write_ratings_dry_run(capsys, tmp_path):
+    f = tmp_path / "x.CR2"
+    f.touch()
+
+    written = write_ratings([(f, 5)], dry_run=True)
+
+    assert written == 1
+    assert "[DRY RUN]" in capsys.readouterr().out
+    assert not (tmp_path / "x.CR2.xmp").exists()
+
+
+# --- ExifToolSession Tests ---
+
+def _make_session_proc(stdout_lines):
+    """Build a mock Popen whose stdout yields the given lines then EOF."""
+    proc = MagicMock()
+    proc.stdout.readline.side_effect = list(stdout_lines) + [""]
+    return proc
+
+@patch("good_birds.rating.get_exiftool_cmd", return_value=None)
+def test_session_requires_exiftool(mock_get_cmd):
+    with pytest.raises(RuntimeError):
+        ExifToolSession().__enter__()
+
+@patch("good_birds.rating.get_exiftool_cmd", return_value=["exiftool"])
+@patch("good_birds.rating.subprocess.Popen")
+def test_session_write_rating_success(mock_popen, mock_get_cmd, tmp_path):
+    mock_popen.return_value = _make_session_proc(["    1 image files updated\n", "{ready}\n"])
+
+    dummy = tmp_path / "dummy.CR2"
+    dummy.touch()
+
+    with ExifToolSession() as session:
+        assert session.write_rating(dummy, 4) is True
+
+    # The daemon should be launched once with -stay_open
+    mock_popen.assert_called_once()
+    popen_args = mock_popen.call_args[0][0]
+    assert "-stay_open" in popen_args
+
+    # The arg block should contain the same three tags as write_rating
+    written = "".join(c[0][0] for c in mock_popen.return_value.stdin.write.call_args_list)
+    assert "-XMP:Rating=4" in written
+    assert "-XMP:RatingPercent=75" in written
+    assert "-Rating=4" in written
+    assert "-execute" in written
+
+    # Sidecar should also be created by default
+    assert (tmp_path / "dummy.CR2.xmp").exists()
+
+@patch("good_birds.rating.get_exiftool_cmd", return_value=["exiftool"])
+@patch("good_birds.rating.subprocess.Popen")
+def test_session_write_rating_error(mock_popen, mock_get_cmd, tmp_path):
+    mock_popen.return_value = _make_session_proc(["Error: File not found\n", "{ready}\n"])
+
+    dummy = tmp_path / "missing.CR2"
+    dummy.touch()
+
+    with ExifToolSession() as session:
+        assert session.write_rating(dummy, 5) is False
+
+    # No sidecar on failure
+    assert not (tmp_path / "missing.CR2.xmp").exists()
+
+
 @pytest.mark.integration
 def test_real_exiftool():
     """
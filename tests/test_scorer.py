@@ -1,8 +1,17 @@
+import datetime
+from pathlib import Path
+
 import cv2
 import numpy as np
 from PIL import Image
 
-from good_birds.scorer import calculate_sharpness, calculate_exposure
+from good_birds.models import PhotoInfo
+from good_birds.scorer import (
+    calculate_sharpness,
+    calculate_exposure,
+    is_unrecoverable,
+    score_photo,
+)
 
 def _create_synthetic_image(sharp: bool) -> Image.Image:
     """Create a synthetic image (e.g. checkerboard) that is either sharp or blurry."""
@@ -67,3 +76,30 @@ def test_exposure_calculation():
     
     # Blown highlights are penalized more than crushed shadows in our heuristic
     assert score_crushed >= score_blown
+
+def _photo_info(iso=None, shutter_speed=None):
+    return PhotoInfo(
+        path=Path("dummy.CR2"),
+        timestamp=datetime.datetime(2023, 5, 1, 10, 0, 0),
+        sub_sec="00",
+        iso=iso,
+        shutter_speed=shutter_speed,
+    )
+
+def test_is_unrecoverable():
+    # Healthy settings (or no EXIF at all) are scoreable
+    assert not is_unrecoverable(_photo_info())
+    assert not is_unrecoverable(_photo_info(iso=800, shutter_speed="1/2000"))
+
+    # Extreme ISO or a too-slow shutter dooms the shot
+    assert is_unrecoverable(_photo_info(iso=25600))
+    assert is_unrecoverable(_photo_info(shutter_speed="1/15"))
+    assert is_unrecoverable(_photo_info(shutter_speed="0.5s"))
+
+    # Garbage shutter strings don't reject
+    assert not is_unrecoverable(_photo_info(shutter_speed="fast"))
+
+def test_score_photo_skips_unrecoverable():
+    sharp = np.asarray(_create_synthetic_image(sharp=True))
+    info = _photo_info(iso=25600)
+    assert score_photo(info, sharp) == (0.0, 0.0, 0.0)